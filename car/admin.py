@@ -1,5 +1,10 @@
-from django.contrib import admin
-from .models import Vehicle, Feature, VehicleImage,Contact,SiteInfo,Brand,Aboutpage,IndexModel,ShippingPage,Privacy,TermsOfUse
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from .models import Vehicle, Feature, VehicleImage,Contact,SiteInfo,Brand,Aboutpage,IndexModel,ShippingPage,Privacy,TermsOfUse,LeadRollup,MAX_VEHICLE_IMAGES
+from .forms import BulkPhotoForm
 from django.contrib.admin import AdminSite,ModelAdmin
 
 class VehicleImageInline(admin.TabularInline):
@@ -7,7 +12,7 @@ class VehicleImageInline(admin.TabularInline):
     extra = 1
     fields = ("image", "caption", "order",)
     readonly_fields = ()
-    max_num = 20  # prevent admins uploading > 20 images from admin
+    max_num = MAX_VEHICLE_IMAGES  # prevent admins uploading > 20 images from admin
     verbose_name = "Vehicle Image"
     verbose_name_plural = "Vehicle Images"
 
@@ -20,6 +25,47 @@ class VehicleAdmin(admin.ModelAdmin):
     inlines = [VehicleImageInline]
     filter_horizontal = ("features",)
     readonly_fields = ("created_at", "updated_at")
+    change_form_template = "admin/car/vehicle/change_form.html"
+
+    def get_urls(self):
+        urls = [
+            path(
+                "<path:object_id>/bulk-photos/",
+                self.admin_site.admin_view(self.bulk_photos_view),
+                name="car_vehicle_bulk_photos",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def bulk_photos_view(self, request, object_id):
+        # ZIP yoki papkadagi rasmlarni bir martada yuklash (car.photos)
+        from .photos import ingest_photos, upload_sources
+
+        vehicle = self.get_object(request, object_id)
+        if vehicle is None:
+            return self._get_obj_does_not_exist_redirect(request, self.opts, object_id)
+        if not self.has_change_permission(request, vehicle):
+            raise PermissionDenied
+
+        form = BulkPhotoForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            sources = upload_sources(form.cleaned_data["archive"], form.cleaned_data["folder"])
+            # so'rov ichida jarayonlar hovuzi ochilmaydi; katta partiyalar uchun import_photos
+            result = ingest_photos({vehicle: sources}, workers=1)[vehicle]
+            self.message_user(request, f"{vehicle}: {result}", messages.SUCCESS)
+            for error in result.errors:
+                self.message_user(request, error, messages.WARNING)
+            return redirect("admin:car_vehicle_change", vehicle.pk)
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Bulk upload photos",
+            "opts": self.opts,
+            "original": vehicle,
+            "form": form,
+            "max_images": MAX_VEHICLE_IMAGES,
+        }
+        return TemplateResponse(request, "admin/car/vehicle/bulk_photos.html", context)
 
 
 @admin.register(Feature)
@@ -38,6 +84,44 @@ class ContactAdmin(admin.ModelAdmin):
     list_display = ("name", "email", "phone", "car", "created_at")
     list_filter = ("created_at", "car")
     search_fields = ("name", "email", "phone", "message")
+
+
+@admin.register(LeadRollup)
+class SalesDashboardAdmin(admin.ModelAdmin):
+    """Leads per vehicle/brand/day and days-on-lot, read from the rollup tables (car.rollups)."""
+    change_list_template = "admin/car/sales_dashboard.html"
+    period_choices = (7, 30, 90, 365)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        from .rollups import dashboard
+
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            days = int(request.GET.get("days", 30))
+        except ValueError:
+            days = 30
+        if days not in self.period_choices:
+            days = 30
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Sales Dashboard",
+            "opts": self.opts,
+            "period_choices": self.period_choices,
+            **dashboard(days),
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, self.change_list_template, context)
 # pages
 
 class PagesModelAdmin(ModelAdmin):
@@ -73,32 +157,3 @@ class PrivacyAdmin(PagesModelAdmin):
 @admin.register(IndexModel)
 class IndexModelAdmin(ModelAdmin):
     pass
-
-# Admin panelda app nomini o'zgartirish
-from django.apps import apps
-
-# Car app ni Pages deb nomlash
-app_config = apps.get_app_config('car')
-app_config.verbose_name = "Pages"
-
-# Har bir model uchun nomlarni o'zgartirish
-SiteInfo._meta.verbose_name = "Site Info"
-SiteInfo._meta.verbose_name_plural = "Site Infos"
-
-Brand._meta.verbose_name = "Brand"
-Brand._meta.verbose_name_plural = "Brands"
-
-Aboutpage._meta.verbose_name = "About"
-Aboutpage._meta.verbose_name_plural = "About"
-
-ShippingPage._meta.verbose_name = "Shipping"
-ShippingPage._meta.verbose_name_plural = "Shipping"
-
-TermsOfUse._meta.verbose_name = "Terms of Use"
-TermsOfUse._meta.verbose_name_plural = "Terms of Use"
-
-Privacy._meta.verbose_name = "Privacy"
-Privacy._meta.verbose_name_plural = "Privacy"
-
-IndexModel._meta.verbose_name = "Home Page"
-IndexModel._meta.verbose_name_plural = "Home Pages"
\ No newline at end of file
@@ -1,6 +1,27 @@
 from django.apps import AppConfig
 
+# Admin panelda modellar nomlari (migratsiyaga tegmaslik uchun Meta da emas)
+ADMIN_VERBOSE_NAMES = {
+    "SiteInfo": ("Site Info", "Site Infos"),
+    "Brand": ("Brand", "Brands"),
+    "Aboutpage": ("About", "About"),
+    "ShippingPage": ("Shipping", "Shipping"),
+    "TermsOfUse": ("Terms of Use", "Terms of Use"),
+    "Privacy": ("Privacy", "Privacy"),
+    "IndexModel": ("Home Page", "Home Pages"),
+}
+
 
 class CarConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'car'
+    # Car app ni admin panelda Pages deb nomlash
+    verbose_name = "Pages"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        for model_name, (verbose_name, verbose_name_plural) in ADMIN_VERBOSE_NAMES.items():
+            opts = self.get_model(model_name)._meta
+            opts.verbose_name = verbose_name
+            opts.verbose_name_plural = verbose_name_plural
@@ -1,3 +1,5 @@
+import zipfile
+
 from django import forms
 from .models import Contact
 
@@ -5,3 +7,36 @@ class ContactForm(forms.ModelForm):
     class Meta:
         model = Contact
         fields = ["name", "email", "phone", "message"]
+
+
+class MultipleFileInput(forms.ClearableFileInput):
+    allow_multiple_selected = True
+
+
+class MultipleFileField(forms.FileField):
+    def clean(self, data, initial=None):
+        if isinstance(data, (list, tuple)):
+            return [super(MultipleFileField, self).clean(item, initial) for item in data]
+        cleaned = super().clean(data, initial)
+        return [cleaned] if cleaned else []
+
+
+class BulkPhotoForm(forms.Form):
+    archive = forms.FileField(required=False, label="ZIP archive")
+    folder = MultipleFileField(
+        required=False,
+        label="Folder",
+        widget=MultipleFileInput(attrs={"webkitdirectory": True}),
+    )
+
+    def clean_archive(self):
+        archive = self.cleaned_data["archive"]
+        if archive and not zipfile.is_zipfile(archive):
+            raise forms.ValidationError("Upload a .zip file.")
+        return archive
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get("archive") and not cleaned_data.get("folder"):
+            raise forms.ValidationError("Choose a ZIP archive or a folder of photos.")
+        return cleaned_data
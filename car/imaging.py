@@ -0,0 +1,77 @@
+"""
+Process pool workers for car/photos.py.
+
+This module must not import Django: under the spawn and forkserver start
+methods (macOS, Windows, Linux from Python 3.14) every worker re-imports the
+module of the function it runs, and the app registry is not set up there.
+"""
+import hashlib
+import io
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+MAX_EDGE = 2560
+JPEG_QUALITY = 85
+
+
+def read_source(source):
+    """Return (name, bytes) for a path, a (zip path, member) or a (name, bytes) source."""
+    if isinstance(source, str):
+        return os.path.basename(source), Path(source).read_bytes()
+    first, second = source
+    if isinstance(second, bytes):
+        return first, second
+    with zipfile.ZipFile(first) as archive:
+        return PurePosixPath(second).name, archive.read(second)
+
+
+def dhash(image, size=8):
+    """64-bit difference hash: survives re-encoding, resizing and small edits."""
+    pixels = list(image.convert("L").resize((size + 1, size), Image.Resampling.LANCZOS).getdata())
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = value << 1 | (left > right)
+    return value
+
+
+def fingerprint_photo(source):
+    """Worker: perceptual hash of an already stored image."""
+    try:
+        _, data = read_source(source)
+        with Image.open(io.BytesIO(data)) as image:
+            return dhash(ImageOps.exif_transpose(image))
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        return None
+
+
+def normalize_photo(source):
+    """
+    Worker: decode, auto-rotate, strip metadata, downscale and re-encode one photo.
+    Returns a dict; on failure the dict carries "error" instead of "data".
+    """
+    name = None
+    try:
+        name, data = read_source(source)
+        digest = hashlib.sha256(data).hexdigest()
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            image.thumbnail((MAX_EDGE, MAX_EDGE), Image.Resampling.LANCZOS)
+            # yangi Image ga ko'chirish EXIF/ICC/XMP ning hammasini tashlab yuboradi
+            clean = Image.new("RGB", image.size)
+            clean.paste(image)
+            output = io.BytesIO()
+            clean.save(output, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+            phash = dhash(clean)
+    except UnidentifiedImageError:
+        return {"name": name or str(source), "error": "not a recognised image format"}
+    except (OSError, Image.DecompressionBombError) as exc:
+        return {"name": name or str(source), "error": str(exc)}
+    return {"name": name, "data": output.getvalue(), "digest": digest, "phash": phash}
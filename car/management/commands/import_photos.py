@@ -0,0 +1,72 @@
+import os
+import zipfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from car.models import Vehicle
+from car.photos import folder_sources, ingest_photos, zip_sources
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import vehicle photos from a ZIP or a folder. Each top-level directory "
+        "is matched to a vehicle by VIN, stock number or id, unless --vehicle is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Path to a .zip archive or a folder.")
+        parser.add_argument(
+            "--vehicle",
+            help="VIN, stock number or id of the vehicle that gets every photo in the source.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Size of the image processing pool (default: number of CPUs).",
+        )
+
+    def handle(self, *args, **options):
+        source = Path(options["source"])
+        if source.is_dir():
+            groups = folder_sources(source)
+        elif zipfile.is_zipfile(source):
+            groups = zip_sources(source)
+        else:
+            raise CommandError(f"{source} is neither a folder nor a ZIP archive.")
+
+        if options["vehicle"]:
+            vehicle = self.find_vehicle(options["vehicle"])
+            if vehicle is None:
+                raise CommandError(f"No vehicle matches {options['vehicle']!r}.")
+            batch = {vehicle: [item for items in groups.values() for item in items]}
+        else:
+            batch = {}
+            for key, items in groups.items():
+                vehicle = self.find_vehicle(key) if key else None
+                if vehicle is None:
+                    self.stderr.write(self.style.WARNING(
+                        f"Skipping {len(items)} photo(s) in {key or 'the top level'!r}: no matching vehicle."
+                    ))
+                    continue
+                batch.setdefault(vehicle, []).extend(items)
+
+        if not batch:
+            raise CommandError("Nothing to import.")
+
+        results = ingest_photos(batch, workers=options["workers"])
+        for vehicle, result in results.items():
+            self.stdout.write(f"{vehicle}: {result}")
+            for error in result.errors:
+                self.stderr.write(self.style.WARNING(f"    {error}"))
+        total = sum(len(result.created) for result in results.values())
+        self.stdout.write(self.style.SUCCESS(f"Imported {total} photo(s) for {len(results)} vehicle(s)."))
+
+    @staticmethod
+    def find_vehicle(key):
+        lookup = Q(vin__iexact=key) | Q(stock_number__iexact=key)
+        if key.isdigit():
+            lookup |= Q(pk=int(key))
+        return Vehicle.objects.filter(lookup).order_by().first()
@@ -0,0 +1,274 @@
+import secrets
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from car.models import Vehicle, VehicleImage
+from car.views import CarDetailView, HomeView
+
+
+# GET parametrlari HomeView filterlari bilan bir xil
+HOME_REQUESTS = [
+    ("home", {}),
+    ("home: year range", {"year": "2010-2019"}),
+    ("home: price range", {"min_price": "20000", "max_price": "60000"}),
+    ("home: year + price range", {"year": "2010-2019", "min_price": "20000", "max_price": "60000"}),
+]
+
+ADMIN_REQUESTS = [
+    ("admin: vehicles", "vehicle", {}),
+    ("admin: vehicles by year", "vehicle", {"year": "2015"}),
+    ("admin: contacts", "contact", {}),
+    ("admin: contacts for car", "contact", {"car__id__exact": None}),
+    ("admin: vehicle images", "vehicleimage", {}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays the query shapes of car.views and the admin changelists, runs "
+        "EXPLAIN QUERY PLAN on each and flags full table scans, full index scans "
+        "and temp B-tree sorts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare plans without the indexes declared in car models (undeclared "
+                 "indexes kept) and with them (undeclared indexes dropped), inside a "
+                 "transaction that is rolled back.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Print every plan, not only the flagged ones.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("index_advisor only understands SQLite query plans.")
+
+        if not options["verify"]:
+            report = self.collect()
+            self.print_report(report, show_all=options["all"])
+            return
+
+        # "oldin": e'lon qilingan indekslarsiz, eskilari bilan; "keyin": migratsiyadagidek
+        with transaction.atomic():
+            stale = self.stale_indexes()
+            self.drop_declared_indexes()
+            before = self.collect()
+            self.create_declared_indexes()
+            self.drop_stale_indexes(stale)
+            after = self.collect()
+            transaction.set_rollback(True)
+
+        if stale:
+            self.stdout.write(self.style.WARNING(
+                "Undeclared indexes kept in the baseline and dropped for the comparison: "
+                + ", ".join(name for _, name in stale)
+            ))
+        self.stdout.write(self.style.MIGRATE_HEADING("Without declared indexes:"))
+        self.print_report(before, show_all=options["all"])
+        self.stdout.write(self.style.MIGRATE_HEADING("With declared indexes:"))
+        self.print_report(after, show_all=options["all"])
+        self.print_comparison(before, after)
+
+    # --- query shapes ---
+
+    def replay(self):
+        """
+        Yield (label, callable) pairs; every callable runs one query shape and
+        may return querysets to explain even if running it never read them.
+        """
+        factory = RequestFactory()
+        car = Vehicle.objects.order_by().first() or Vehicle(pk=0)
+
+        def home(params):
+            view = HomeView()
+            view.setup(factory.get("/", params))
+            view.object_list = queryset = view.get_queryset()
+            response = view.render_to_response(view.get_context_data())
+            if response.streaming:
+                b"".join(response.streaming_content)
+            else:
+                response.render()
+            # filtrga mos mashina bo'lmasa qatorlar o'qilmaydi; reja ma'lumotga bog'liq bo'lmasin
+            return [queryset, VehicleImage.objects.filter(vehicle__in=[car.pk])]
+
+        def detail():
+            view = CarDetailView()
+            view.setup(factory.get(f"/car/{car.pk}/"), pk=car.pk)
+            view.object = car
+            context = view.get_context_data()
+            list(context["images"])
+            car.get_primary_image()
+
+        def contacts_for_car():
+            list(car.contacts.all())
+
+        def changelist(model_name, params):
+            model = apps.get_model("car", model_name)
+            model_admin = admin.site._registry[model]
+            request = factory.get(f"/admin/car/{model_name}/", params)
+            request.user = User(is_active=True, is_staff=True, is_superuser=True)
+            cl = model_admin.get_changelist_instance(request)
+            list(cl.result_list)
+
+        for label, params in HOME_REQUESTS:
+            yield label, lambda params=params: home(params)
+        yield "vehicle detail", detail
+        yield "contacts for car", contacts_for_car
+        for label, model_name, params in ADMIN_REQUESTS:
+            params = {key: car.pk if value is None else value for key, value in params.items()}
+            yield label, lambda model_name=model_name, params=params: changelist(model_name, params)
+
+    def collect(self):
+        """Run every shape and return [(label, sql, plan rows)] for its SELECTs."""
+        report = []
+        seen = set()
+        # sqlite3 modulining statement keshi EXPLAIN ni indekslar o'zgargandan keyin
+        # qayta tayyorlamaydi: har yig'ishda matn boshqacha bo'lsin
+        tag = f"/* {secrets.token_hex(4)} */"
+        with connection.cursor() as cursor:
+            for label, run in self.replay():
+                with CaptureQueriesContext(connection) as ctx:
+                    querysets = run() or []
+                queries = [(query["sql"], None) for query in ctx.captured_queries]
+                queries += [queryset.query.sql_with_params() for queryset in querysets]
+                for sql, params in queries:
+                    text = sql if params is None else connection.ops.last_executed_query(cursor, sql, params)
+                    if not text.lstrip().upper().startswith("SELECT") or text in seen:
+                        continue
+                    seen.add(text)
+                    cursor.execute(f"EXPLAIN QUERY PLAN {tag} {sql}", params)
+                    plan = [row[-1] for row in cursor.fetchall()]
+                    report.append((label, text, plan))
+        return report
+
+    @staticmethod
+    def flags(plan):
+        # faqat SEARCH indeks orqali o'qish; "SCAN ... USING INDEX" butun indeksni aylanadi
+        found = []
+        for detail in plan:
+            if not detail.startswith("SCAN ") or "CONSTANT ROW" in detail:
+                if "USE TEMP B-TREE" in detail:
+                    found.append(f"temp sort: {detail}")
+            elif " USING " in detail:
+                found.append(f"index scan: {detail}")
+            else:
+                found.append(f"full scan: {detail}")
+        return found
+
+    # --- index management for --verify ---
+
+    def declared_indexes(self):
+        # faqat bazada jadvali bor modellar (migratsiyasi qo'llanmaganlari o'tkazib yuboriladi)
+        tables = set(connection.introspection.table_names())
+        for model in apps.get_app_config("car").get_models():
+            if model._meta.db_table not in tables:
+                continue
+            for index in model._meta.indexes:
+                yield model, index
+
+    def existing_index_names(self, model):
+        with connection.cursor() as cursor:
+            return set(connection.introspection.get_constraints(cursor, model._meta.db_table))
+
+    def stale_indexes(self):
+        """
+        Plain indexes on the advised tables that no model declares any more
+        (e.g. the old single-column `year` index): not unique, not the primary
+        key and not the db_index of a single field.
+        """
+        declared = {index.name for _, index in self.declared_indexes()}
+        models = {model for model, _ in self.declared_indexes()}
+        stale = []
+        with connection.cursor() as cursor:
+            for model in models:
+                field_columns = {
+                    field.column for field in model._meta.local_fields if field.db_index or field.unique
+                }
+                constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                for name, info in constraints.items():
+                    if (
+                        info["index"]
+                        and not info["unique"]
+                        and not info["primary_key"]
+                        and name not in declared
+                        and not (len(info["columns"]) == 1 and info["columns"][0] in field_columns)
+                    ):
+                        stale.append((model, name))
+        return stale
+
+    def drop_declared_indexes(self):
+        with connection.cursor() as cursor:
+            for model, index in self.declared_indexes():
+                if index.name in self.existing_index_names(model):
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+
+    def create_declared_indexes(self):
+        # schema_editor() ni "with" siz ishlatamiz: SQLite atomic blok ichida
+        # foreign key tekshiruvini o'chira olmaydi, bizga esa faqat SQL kerak
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, index in self.declared_indexes():
+                if index.name not in self.existing_index_names(model):
+                    cursor.execute(str(index.create_sql(model, editor)))
+
+    def drop_stale_indexes(self, stale):
+        with connection.cursor() as cursor:
+            for model, name in stale:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+
+    # --- output ---
+
+    def print_report(self, report, show_all=False):
+        flagged = 0
+        for label, sql, plan in report:
+            found = self.flags(plan)
+            flagged += bool(found)
+            if not found and not show_all:
+                continue
+            self.stdout.write(f"{label}: {sql[:160]}{'...' if len(sql) > 160 else ''}")
+            for detail in plan:
+                line = f"    {detail}"
+                if any(detail in flag for flag in found):
+                    line = self.style.WARNING(line)
+                self.stdout.write(line)
+        self.stdout.write(f"{flagged} of {len(report)} queries flagged.\n")
+
+    def print_comparison(self, before, after):
+        after_by_label = {}
+        for label, sql, plan in after:
+            after_by_label.setdefault(label, []).extend(self.flags(plan))
+
+        before_by_label = {}
+        for label, sql, plan in before:
+            before_by_label.setdefault(label, []).extend(self.flags(plan))
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Flags per query shape (before -> after):"))
+        improved = worse = 0
+        for label in before_by_label:
+            old = len(before_by_label.get(label, []))
+            new = len(after_by_label.get(label, []))
+            improved += new < old
+            worse += new > old
+            line = f"  {label}: {old} -> {new}"
+            if new > old:
+                line = self.style.ERROR(line)
+            elif new < old:
+                line = self.style.SUCCESS(line)
+            self.stdout.write(line)
+            for flag in after_by_label.get(label, []):
+                self.stdout.write(f"      still: {flag}")
+
+        if worse:
+            raise CommandError(f"{worse} query shape(s) got worse with the declared indexes.")
+        self.stdout.write(self.style.SUCCESS(f"{improved} query shape(s) improved, none got worse."))
@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Yangi worker birinchi so'rovga javob berguncha ketadigan vaqt chegarasi (ms).
+# O'lchangan qiymat (-X importtime siz, 1 CPU): 3 tadan eng yaxshisi ~310 ms, bittasi
+# 520 ms gacha; shuning uchun ikki baravar zaxira bilan 600 ms.
+# car.tests.StartupBudgetTests bu chegarani test to'plamida kuzatib boradi
+TIME_TO_FIRST_REQUEST_BUDGET_MS = 600
+
+# Alohida jarayonda ishlaydi: bu buyruqning o'zi yuklagan modullar o'lchovni buzmasligi uchun
+PROBE = r"""
+import json, os, sys, time
+from io import BytesIO
+
+start = time.perf_counter()
+phases = []
+
+def mark(name):
+    phases.append((name, (time.perf_counter() - start) * 1000))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+mark("settings")
+
+django.setup(set_prefix=False)
+mark("apps.populate (models, admin, ready)")
+
+from django.core.handlers.wsgi import WSGIHandler
+application = WSGIHandler()
+mark("middleware")
+
+from django.urls import get_resolver
+get_resolver().url_patterns
+mark("urlconf (views)")
+
+from wsgiref.util import setup_testing_defaults
+environ = {"PATH_INFO": sys.argv[1], "HTTP_HOST": "localhost", "wsgi.input": BytesIO()}
+setup_testing_defaults(environ)
+status = []
+body = b"".join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+mark("first request")
+
+print(json.dumps({"phases": phases, "status": status[0], "bytes": len(body)}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot a fresh Python process like a new worker and report import time per "
+        "module, Django setup phases and time-to-first-request. Timings come from "
+        "plain boots; one extra boot under -X importtime gives the module table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/", help="URL of the first request (default: /).")
+        parser.add_argument("--top", type=int, default=20, help="How many modules to list (default: 20).")
+        parser.add_argument("--runs", type=int, default=3, help="Boots to measure; the fastest one is reported.")
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=TIME_TO_FIRST_REQUEST_BUDGET_MS,
+            help=f"Fail when time-to-first-request exceeds this many ms (default: {TIME_TO_FIRST_REQUEST_BUDGET_MS}).",
+        )
+
+    def handle(self, *args, **options):
+        # -X importtime har bir importni sekinlashtiradi: vaqtlar undan tashqarida o'lchanadi
+        runs = [self.boot(options["path"])[0] for _ in range(max(options["runs"], 1))]
+        report = min(runs, key=lambda run: run["phases"][-1][1])
+        _, imports = self.boot(options["path"], importtime=True)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Slowest imports (cumulative, top {options['top']}):"))
+        for module, self_us, cumulative_us in sorted(imports, key=lambda row: -row[2])[:options["top"]]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms self  {module}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Django setup phases:"))
+        previous = 0
+        for name, elapsed in report["phases"]:
+            self.stdout.write(f"  {elapsed - previous:8.1f} ms  {name}")
+            previous = elapsed
+
+        total = report["phases"][-1][1]
+        line = (
+            f"Time to first request: {total:.1f} ms (GET {options['path']} -> {report['status']}, "
+            f"{report['bytes']} bytes, best of {len(runs)}), budget {options['budget']:.0f} ms."
+        )
+        if total > options["budget"]:
+            raise CommandError(line)
+        self.stdout.write(self.style.SUCCESS(line))
+
+    def boot(self, path, importtime=False):
+        env = dict(os.environ)
+        env.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+        flags = ["-X", "importtime"] if importtime else []
+        process = subprocess.run(
+            [sys.executable, *flags, "-c", PROBE, path],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(f"Startup probe failed:\n{process.stderr[-2000:]}")
+
+        imports = []
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            self_us, cumulative_us, module = (part.strip() for part in line[len("import time:"):].split("|"))
+            if self_us.isdigit():
+                imports.append((module, int(self_us), int(cumulative_us)))
+        return json.loads(process.stdout.strip().splitlines()[-1]), imports
@@ -0,0 +1,35 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from car import rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Catch up the sales analytics rollups from Contact and Vehicle. By default "
+        "the last two days of leads are recomputed; use --since or --full for more."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Recompute lead rollups from this date (YYYY-MM-DD).")
+        parser.add_argument("--days", type=int, default=2, help="Recompute the last N days of leads (default: 2).")
+        parser.add_argument("--full", action="store_true", help="Rebuild every rollup from scratch.")
+
+    def handle(self, *args, **options):
+        if options["full"]:
+            since = None
+        elif options["since"]:
+            try:
+                since = date.fromisoformat(options["since"])
+            except ValueError:
+                raise CommandError(f"Invalid date {options['since']!r}, expected YYYY-MM-DD.")
+        else:
+            since = timezone.localdate() - timedelta(days=max(options["days"], 1) - 1)
+
+        lead_rows, inventory_rows = rollups.rebuild(since)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {lead_rows} lead rollup row(s) since {since or 'the beginning'} "
+            f"and {inventory_rows} inventory rollup row(s)."
+        ))
@@ -0,0 +1,120 @@
+"""
+Response compression that keeps streamed pages streaming.
+
+Django's GZipMiddleware only emits output when zlib's buffer fills up, which
+holds back the page head of a streamed inventory page. Here every streamed
+chunk is sync-flushed, so the browser gets each piece as soon as it is rendered.
+
+BREACH: pages that carry a CSRF token (the contact forms) are only gzipped,
+with Django's random-length gzip header padding ("Heal The Breach") on top of
+the per-request CSRF token masking. Brotli has no such padding, so it is used
+only for responses that never asked for a CSRF token. Brotli is optional:
+install the `brotli` package to enable it.
+"""
+import secrets
+import zlib
+
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def accepted_encodings(header):
+    """
+    Content codings an Accept-Encoding header allows: "q=0" refuses a coding
+    and "*" stands for br and gzip unless they are refused by name.
+    """
+    accepted, refused = set(), set()
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        coding = coding.lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        (accepted if quality > 0 else refused).add(coding)
+    if "*" in accepted:
+        accepted |= {"br", "gzip"} - refused
+    return accepted - refused
+
+
+def gzip_stream(chunks, max_random_bytes):
+    """gzip a chunk iterator, flushing after every chunk; the header carries a random-length file name."""
+    filename = b"a" * secrets.randbelow(max_random_bytes) + b"\x00"
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    crc = size = 0
+    # gzip header: FNAME flag, mtime 0, OS unknown
+    yield b"\x1f\x8b\x08\x08\x00\x00\x00\x00\x00\xff" + filename
+    for chunk in chunks:
+        if not chunk:
+            continue
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush() + crc.to_bytes(4, "little") + (size & 0xFFFFFFFF).to_bytes(4, "little")
+
+
+def brotli_stream(chunks):
+    compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=5)
+    for chunk in chunks:
+        if chunk:
+            yield compressor.process(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if not response.streaming and len(response.content) < 200:
+            return response
+
+        encodings = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        # get_token() shu kalitni qo'yadi: javobda CSRF token bor
+        carries_csrf_token = "CSRF_COOKIE_NEEDS_UPDATE" in request.META
+        use_brotli = (
+            brotli is not None
+            and not carries_csrf_token
+            and "br" in encodings
+            and not (response.streaming and response.is_async)
+        )
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if not use_brotli and "gzip" not in encodings:
+            return response
+        # qolgan hollarda Django ning o'z GZipMiddleware i yetarli
+        if not use_brotli and (not response.streaming or response.is_async):
+            return super().process_response(request, response)
+
+        if use_brotli:
+            encoding = "br"
+            if response.streaming:
+                response.streaming_content = brotli_stream(response.streaming_content)
+            else:
+                compressed = brotli.compress(response.content, mode=brotli.MODE_TEXT, quality=5)
+                if len(compressed) >= len(response.content):
+                    return response
+                response.content = compressed
+                response.headers["Content-Length"] = str(len(compressed))
+        else:
+            encoding = "gzip"
+            response.streaming_content = gzip_stream(response.streaming_content, self.max_random_bytes)
+
+        if response.streaming:
+            del response.headers["Content-Length"]
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,192 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:20
+
+import car.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    # 0001-0012 were applied on the production database but never committed;
+    # this migration rebuilds the same schema and stands in for them.
+    replaces = [
+        ('car', '0001_initial'),
+        ('car', '0002_siteinfo'),
+        ('car', '0003_vehicle_location'),
+        ('car', '0004_brand_vehicle_brand'),
+        ('car', '0005_siteinfo_email_siteinfo_location_siteinfo_phone_and_more'),
+        ('car', '0006_siteinfo_opening_hours'),
+        ('car', '0007_aboutpage'),
+        ('car', '0008_siteinfo_logo_siteinfo_video'),
+        ('car', '0009_remove_siteinfo_video'),
+        ('car', '0010_siteinfo_video'),
+        ('car', '0011_indexmodel'),
+        ('car', '0012_privacy_shippingpage_termsofuse_aboutpage_code'),
+    ]
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Aboutpage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, max_length=255, null=True)),
+                ('text', models.TextField(blank=True, null=True)),
+                ('banner', models.ImageField(null=True, upload_to='sitesettings/about')),
+                ('code', models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Brand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Contacts',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone', models.CharField(max_length=500)),
+                ('email', models.CharField(max_length=500)),
+                ('work_days', models.CharField(max_length=600)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Feature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, unique=True, verbose_name='feature name')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='feature description')),
+            ],
+            options={
+                'verbose_name': 'Feature',
+                'verbose_name_plural': 'Features',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='IndexModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Privacy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ShippingPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SiteInfo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('site_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('banner', models.ImageField(null=True, upload_to='sitesettings')),
+                ('logo', models.ImageField(null=True, upload_to='sitesettings')),
+                ('showroom_iframe', models.TextField()),
+                ('email', models.CharField(blank=True, max_length=255, null=True)),
+                ('phone', models.CharField(blank=True, max_length=255, null=True)),
+                ('location', models.TextField(blank=True, null=True)),
+                ('opening_hours', models.TextField(blank=True, null=True)),
+                ('video', models.FileField(upload_to='sitesettings/videos')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TermsOfUse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.TextField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Vehicle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, max_length=255, null=True, verbose_name='title')),
+                ('price', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True, verbose_name='price (USD)')),
+                ('mileage', models.PositiveIntegerField(blank=True, null=True, verbose_name='mileage (mi)')),
+                ('engine', models.CharField(blank=True, max_length=255, null=True, verbose_name='engine')),
+                ('year', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='year')),
+                ('location', models.CharField(blank=True, max_length=100, null=True, verbose_name='Location')),
+                ('transmission', models.CharField(blank=True, max_length=100, null=True, verbose_name='transmission')),
+                ('fuel_type', models.CharField(blank=True, choices=[('gasoline', 'Gasoline'), ('diesel', 'Diesel'), ('electric', 'Electric'), ('hybrid', 'Hybrid'), ('other', 'Other')], max_length=20, null=True, verbose_name='fuel type')),
+                ('drivetrain', models.CharField(blank=True, choices=[('rwd', 'RWD'), ('fwd', 'FWD'), ('awd', 'AWD'), ('4wd', '4WD'), ('other', 'Other')], max_length=10, null=True, verbose_name='drivetrain')),
+                ('body_style', models.CharField(blank=True, choices=[('sedan', 'Sedan'), ('hatchback', 'Hatchback'), ('coupe', 'Coupe'), ('convertible', 'Convertible'), ('pickup', 'Pickup Truck'), ('wagon', 'Wagon'), ('suv', 'SUV'), ('other', 'Other')], max_length=50, null=True, verbose_name='body style')),
+                ('exterior_color', models.CharField(blank=True, max_length=100, null=True, verbose_name='exterior color')),
+                ('interior_color', models.CharField(blank=True, max_length=100, null=True, verbose_name='interior color')),
+                ('vin', models.CharField(blank=True, max_length=50, null=True, unique=True, verbose_name='VIN')),
+                ('stock_number', models.CharField(blank=True, max_length=100, null=True, verbose_name='stock number')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='vehicle description')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('extra_1', models.CharField(blank=True, max_length=255, null=True, verbose_name='extra field 1')),
+                ('extra_2', models.CharField(blank=True, max_length=255, null=True, verbose_name='extra field 2')),
+                ('brand', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to='car.brand')),
+                ('features', models.ManyToManyField(blank=True, related_name='vehicles', to='car.feature', verbose_name='features')),
+            ],
+            options={
+                'verbose_name': 'Vehicle',
+                'verbose_name_plural': 'Vehicles',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Contact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=255, null=True, verbose_name='user name')),
+                ('email', models.EmailField(blank=True, max_length=254, null=True, verbose_name='user email')),
+                ('phone', models.CharField(blank=True, max_length=50, null=True, verbose_name='phone number')),
+                ('message', models.TextField(blank=True, null=True, verbose_name='message')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='submitted at')),
+                ('car', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='contacts', to='car.vehicle', verbose_name='related vehicle')),
+            ],
+            options={
+                'verbose_name': 'Contact Request',
+                'verbose_name_plural': 'Contact Requests',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='VehicleImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ImageField(blank=True, null=True, upload_to=car.models.vehicle_image_upload_to, verbose_name='image file')),
+                ('caption', models.CharField(blank=True, max_length=255, null=True, verbose_name='caption')),
+                ('order', models.PositiveSmallIntegerField(default=0, verbose_name='display order')),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True, verbose_name='uploaded at')),
+                ('vehicle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='car.vehicle', verbose_name='vehicle')),
+            ],
+            options={
+                'verbose_name': 'Vehicle Image',
+                'verbose_name_plural': 'Vehicle Images',
+                'ordering': ['order', '-uploaded_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['vin'], name='car_vehicle_vin_0c59b7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['stock_number'], name='car_vehicle_stock_n_f3d7cf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['year'], name='car_vehicle_year_3fd9ea_idx'),
+        ),
+    ]
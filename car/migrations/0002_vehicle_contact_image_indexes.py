@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('car', '0001_squashed_0012_privacy_shippingpage_termsofuse_aboutpage_code'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vehicle',
+            name='car_vehicle_year_3fd9ea_idx',
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['car', '-created_at', '-id'], name='car_contact_car_id_c0d1f1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['-created_at', '-id'], name='car_contact_created_62c0f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['year', 'price'], name='car_vehicle_year_1027b9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['-created_at', '-id'], name='car_vehicle_created_5dc078_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicleimage',
+            index=models.Index(fields=['vehicle', 'order', '-uploaded_at'], name='car_vehicle_vehicle_df6106_idx'),
+        ),
+    ]
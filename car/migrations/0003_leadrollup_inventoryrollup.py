@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_rollups(apps, schema_editor):
+    # mavjud murojaat va mashinalar uchun rollups.rebuild() bilan bir xil hisob
+    Contact = apps.get_model("car", "Contact")
+    Vehicle = apps.get_model("car", "Vehicle")
+    LeadRollup = apps.get_model("car", "LeadRollup")
+    InventoryRollup = apps.get_model("car", "InventoryRollup")
+    LeadRollup.objects.bulk_create(
+        LeadRollup(day=row["day"], vehicle_id=row["car"], brand_id=row["car__brand"], leads=row["total"])
+        for row in Contact.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "car", "car__brand")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    InventoryRollup.objects.bulk_create(
+        InventoryRollup(day=row["day"], brand_id=row["brand"], vehicles=row["total"])
+        for row in Vehicle.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "brand")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('car', '0002_vehicle_contact_image_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='listed on')),
+                ('vehicles', models.PositiveIntegerField(default=0, verbose_name='vehicles')),
+                ('brand', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='car.brand', verbose_name='brand')),
+            ],
+            options={
+                'verbose_name': 'Inventory Rollup',
+                'verbose_name_plural': 'Inventory Rollups',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'brand'), name='car_inventoryrollup_day_brand_uniq'), models.UniqueConstraint(condition=models.Q(('brand', None)), fields=('day',), name='car_inventoryrollup_day_nobrand_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LeadRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('leads', models.PositiveIntegerField(default=0, verbose_name='leads')),
+                ('brand', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='car.brand', verbose_name='brand')),
+                ('vehicle', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='car.vehicle', verbose_name='vehicle')),
+            ],
+            options={
+                'verbose_name': 'Sales Dashboard',
+                'verbose_name_plural': 'Sales Dashboard',
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'vehicle'), name='car_leadrollup_day_vehicle_uniq'), models.UniqueConstraint(condition=models.Q(('vehicle', None)), fields=('day',), name='car_leadrollup_day_general_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
@@ -29,6 +29,8 @@ BODY_STYLE_CHOICES = [
     ("other", "Other"),
 ]
 
+MAX_VEHICLE_IMAGES = 20
+
 
 class Feature(models.Model):
     """
@@ -87,7 +89,12 @@ class Vehicle(models.Model):
         indexes = [
             models.Index(fields=["vin"]),
             models.Index(fields=["stock_number"]),
-            models.Index(fields=["year"]),
+            # home page filters: year range first, price range read from the index;
+            # the -created_at order still needs a sort over the matching rows
+            models.Index(fields=["year", "price"]),
+            # default ordering (home page, admin changelist, related-field choices);
+            # "-id" matches the pk tie-breaker the admin appends
+            models.Index(fields=["-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -96,9 +103,9 @@ class Vehicle(models.Model):
         return f"Vehicle {self.pk} - {self.vin or 'no-vin'}"
 
     def clean(self):
-        # Validate number of images not exceeding 20
+        # Validate number of images not exceeding MAX_VEHICLE_IMAGES
         # Note: this will work when related VehicleImage instances are available in memory (e.g., in admin forms).
-        max_images = 20
+        max_images = MAX_VEHICLE_IMAGES
         if self.pk:
             images_count = self.images.count()
             if images_count > max_images:
@@ -130,6 +137,10 @@ class VehicleImage(models.Model):
         ordering = ["order", "-uploaded_at"]
         verbose_name = "Vehicle Image"
         verbose_name_plural = "Vehicle Images"
+        indexes = [
+            # vehicle gallery and get_primary_image()
+            models.Index(fields=["vehicle", "order", "-uploaded_at"]),
+        ]
 
     def __str__(self):
         return f"Image {self.pk} for Vehicle {self.vehicle_id}"
@@ -158,6 +169,12 @@ class Contact(models.Model):
         verbose_name = "Contact Request"
         verbose_name_plural = "Contact Requests"
         ordering = ['-created_at']
+        indexes = [
+            # leads for one car, newest first
+            models.Index(fields=["car", "-created_at", "-id"]),
+            # admin changelist
+            models.Index(fields=["-created_at", "-id"]),
+        ]
 
     def __str__(self):
         if self.car:
@@ -196,3 +213,55 @@ class Privacy(models.Model):
     code = models.TextField()
     
 
+
+# analytics rollups (car/rollups.py da yangilanadi)
+class LeadRollup(models.Model):
+    """
+    Contact requests per (day, vehicle); brand is the vehicle's current brand
+    and general contacts have neither. Kept up to date by signals;
+    `manage.py rollup_analytics` recomputes it from Contact.
+    """
+    day = models.DateField(verbose_name="day")
+    # signallar mashina o'chirilishidan oldin qatorlarni (day, None) ga ko'chiradi
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, blank=True, null=True, related_name="+", verbose_name="vehicle")
+    brand = models.ForeignKey(Brand, on_delete=models.SET_NULL, blank=True, null=True, related_name="+", verbose_name="brand")
+    leads = models.PositiveIntegerField(default=0, verbose_name="leads")
+
+    class Meta:
+        ordering = ["-day"]
+        verbose_name = "Sales Dashboard"
+        verbose_name_plural = "Sales Dashboard"
+        constraints = [
+            models.UniqueConstraint(fields=["day", "vehicle"], name="car_leadrollup_day_vehicle_uniq"),
+            # NULL lar UNIQUE da bir-biridan farqli hisoblanadi
+            models.UniqueConstraint(
+                fields=["day"], condition=models.Q(vehicle=None), name="car_leadrollup_day_general_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day}: {self.leads} lead(s)"
+
+
+class InventoryRollup(models.Model):
+    """
+    Vehicles currently listed, grouped by listing day (Vehicle.created_at) and brand.
+    """
+    day = models.DateField(verbose_name="listed on")
+    # brend o'chsa uning mashinalari ham o'chadi, signallar qatorni undan oldin kamaytiradi
+    brand = models.ForeignKey(Brand, on_delete=models.CASCADE, blank=True, null=True, related_name="+", verbose_name="brand")
+    vehicles = models.PositiveIntegerField(default=0, verbose_name="vehicles")
+
+    class Meta:
+        ordering = ["day"]
+        verbose_name = "Inventory Rollup"
+        verbose_name_plural = "Inventory Rollups"
+        constraints = [
+            models.UniqueConstraint(fields=["day", "brand"], name="car_inventoryrollup_day_brand_uniq"),
+            models.UniqueConstraint(
+                fields=["day"], condition=models.Q(brand=None), name="car_inventoryrollup_day_nobrand_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day}: {self.vehicles} vehicle(s)"
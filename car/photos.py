@@ -0,0 +1,171 @@
+"""
+Bulk photo ingestion for VehicleImage.
+
+Photos are decoded, auto-rotated from their EXIF orientation, stripped of all
+metadata (GPS included), downscaled and re-encoded as JPEG in a process pool
+(the workers live in car/imaging.py). Duplicates are skipped by content hash
+and by perceptual (difference) hash, both within the batch and against the
+images a vehicle already has.
+"""
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Max
+
+from .imaging import fingerprint_photo, normalize_photo
+from .models import MAX_VEHICLE_IMAGES, VehicleImage
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff"}
+# dhash bitlari orasidagi farq shu qiymatdan oshmasa rasm dublikat hisoblanadi
+PHASH_DISTANCE = 4
+
+
+@dataclass
+class IngestResult:
+    created: list = field(default_factory=list)
+    duplicates: list = field(default_factory=list)
+    over_limit: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+    def __str__(self):
+        return (
+            f"{len(self.created)} added, {len(self.duplicates)} duplicates, "
+            f"{len(self.over_limit)} over the {MAX_VEHICLE_IMAGES} image limit, "
+            f"{len(self.errors)} unreadable"
+        )
+
+
+def is_image_name(name):
+    path = PurePosixPath(name)
+    if any(part.startswith(".") or part == "__MACOSX" for part in path.parts):
+        return False
+    return path.suffix.lower() in IMAGE_EXTENSIONS
+
+
+def zip_sources(archive_path):
+    """Group the images of a ZIP by top-level directory: {dir: [(zip, member)]}."""
+    groups = {}
+    with zipfile.ZipFile(archive_path) as archive:
+        for member in sorted(archive.namelist()):
+            if member.endswith("/") or not is_image_name(member):
+                continue
+            parts = PurePosixPath(member).parts
+            group = parts[0] if len(parts) > 1 else ""
+            groups.setdefault(group, []).append((str(archive_path), member))
+    return groups
+
+
+def folder_sources(folder):
+    """Group the images of a folder by immediate subdirectory: {dir: [path]}."""
+    folder = Path(folder)
+    groups = {}
+    for path in sorted(folder.rglob("*")):
+        relative = path.relative_to(folder)
+        if not path.is_file() or not is_image_name(relative.as_posix()):
+            continue
+        group = relative.parts[0] if len(relative.parts) > 1 else ""
+        groups.setdefault(group, []).append(str(path))
+    return groups
+
+
+def _pool_map(func, items, workers):
+    if workers == 1 or len(items) < 2:
+        return list(map(func, items))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items, chunksize=max(1, len(items) // 32)))
+
+
+def _is_duplicate(photo, digests, phashes):
+    if photo["digest"] in digests:
+        return True
+    return any(bin(photo["phash"] ^ other).count("1") <= PHASH_DISTANCE for other in phashes)
+
+
+def ingest_photos(groups, workers=None):
+    """
+    Process {vehicle: [source, ...]} in one shared process pool and attach the
+    photos to their vehicles. Returns {vehicle: IngestResult}.
+    """
+    stored = [
+        (vehicle, image.image.path)
+        for vehicle in groups
+        for image in vehicle.images.all()
+        if image.image and os.path.exists(image.image.path)
+    ]
+    queued = [(vehicle, source) for vehicle, sources in groups.items() for source in sources]
+
+    fingerprints = _pool_map(fingerprint_photo, [path for _, path in stored], workers)
+    photos = _pool_map(normalize_photo, [source for _, source in queued], workers)
+
+    known = {vehicle: set() for vehicle in groups}
+    for (vehicle, _), phash in zip(stored, fingerprints):
+        if phash is not None:
+            known[vehicle].add(phash)
+
+    processed = {vehicle: [] for vehicle in groups}
+    for (vehicle, _), photo in zip(queued, photos):
+        processed[vehicle].append(photo)
+
+    return {vehicle: _attach(vehicle, processed[vehicle], known[vehicle]) for vehicle in groups}
+
+
+def _attach(vehicle, photos, phashes):
+    result = IngestResult()
+    digests = set()
+    written = []
+    try:
+        with transaction.atomic():
+            count = vehicle.images.count()
+            order = (vehicle.images.aggregate(last=Max("order"))["last"] or 0) + 1 if count else 0
+            for photo in photos:
+                if "error" in photo:
+                    result.errors.append(f"{photo['name']}: {photo['error']}")
+                    continue
+                if _is_duplicate(photo, digests, phashes):
+                    result.duplicates.append(photo["name"])
+                    continue
+                if count >= MAX_VEHICLE_IMAGES:
+                    result.over_limit.append(photo["name"])
+                    continue
+                image = VehicleImage(vehicle=vehicle, order=order)
+                image.image.save(f"{Path(photo['name']).stem}.jpg", ContentFile(photo["data"]), save=False)
+                written.append(image.image)
+                image.save()
+                result.created.append(image)
+                digests.add(photo["digest"])
+                phashes.add(photo["phash"])
+                count += 1
+                order += 1
+    except Exception:
+        # tranzaksiya bekor bo'ldi: diskka yozilgan fayllar hech qaysi qatorga bog'lanmaydi
+        for file in written:
+            file.storage.delete(file.name)
+        raise
+    return result
+
+
+def upload_sources(archive=None, files=()):
+    """
+    Sources for an uploaded ZIP and/or uploaded image files. ZIP members are
+    read lazily from the upload's temporary file when Django spooled it to disk.
+    """
+    sources = []
+    if archive:
+        archive_path = archive.temporary_file_path() if hasattr(archive, "temporary_file_path") else None
+        with zipfile.ZipFile(archive) as opened:
+            for member in sorted(opened.namelist()):
+                if member.endswith("/") or not is_image_name(member):
+                    continue
+                if archive_path:
+                    sources.append((archive_path, member))
+                else:
+                    sources.append((PurePosixPath(member).name, opened.read(member)))
+    for upload in files:
+        if is_image_name(upload.name):
+            sources.append((upload.name, upload.read()))
+    return sources
@@ -0,0 +1,164 @@
+"""
+Daily sales analytics rollups.
+
+LeadRollup counts Contact rows per (day, vehicle), carrying the vehicle's
+current brand, and InventoryRollup counts listed vehicles per (listing day,
+brand). Signals in car/signals.py keep them current with the same semantics
+as rebuild(), which recomputes them for bulk changes the signals never see
+(queryset.update(), loaddata, raw SQL).
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F, Func, IntegerField, Sum, Value
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Contact, InventoryRollup, LeadRollup, Vehicle
+
+
+class _DaysSince(Func):
+    """Whole days from a date column to `today`, computed by the database."""
+    template = "(%(expressions)s)"
+    arg_joiner = " - "
+    output_field = IntegerField()
+
+    def __init__(self, expression, today):
+        super().__init__(Value(today, output_field=DateField()), expression)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)", arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+
+def _bump(model, field, amount, defaults=None, **key):
+    """
+    Add `amount` to the counter row matching `key`, creating or dropping it as
+    needed. `key` is backed by a unique constraint, so two concurrent "first"
+    inserts cannot both succeed: the loser retries as an update.
+    """
+    if not amount:
+        return
+    with transaction.atomic():
+        updated = model.objects.filter(**key).update(**{field: F(field) + amount})
+        if not updated and amount > 0:
+            try:
+                with transaction.atomic():
+                    model.objects.create(**key, **(defaults or {}), **{field: amount})
+            except IntegrityError:
+                model.objects.filter(**key).update(**{field: F(field) + amount})
+        elif amount < 0:
+            model.objects.filter(**key, **{f"{field}__lte": 0}).delete()
+
+
+def add_lead(created_at, vehicle_id, brand_id, amount=1):
+    # kalit (kun, mashina); brend mashinaning joriy brendi, umumiy murojaatda esa yo'q
+    _bump(
+        LeadRollup, "leads", amount,
+        defaults={"brand_id": brand_id if vehicle_id else None},
+        day=timezone.localdate(created_at), vehicle_id=vehicle_id,
+    )
+
+
+def add_listing(created_at, brand_id, amount=1):
+    _bump(InventoryRollup, "vehicles", amount, day=timezone.localdate(created_at), brand_id=brand_id)
+
+
+def change_vehicle_brand(vehicle, previous_brand_id):
+    """Move a vehicle's listing and its leads from `previous_brand_id` to its current brand."""
+    add_listing(vehicle.created_at, previous_brand_id, amount=-1)
+    add_listing(vehicle.created_at, vehicle.brand_id)
+    LeadRollup.objects.filter(vehicle_id=vehicle.pk).update(brand_id=vehicle.brand_id)
+
+
+def remove_vehicle(vehicle):
+    """
+    Before a vehicle is deleted: drop its listing and turn its leads into general
+    ones, as Contact.car is SET_NULL and rebuild() would count them that way.
+    """
+    add_listing(vehicle.created_at, vehicle.brand_id, amount=-1)
+    for row in LeadRollup.objects.filter(vehicle_id=vehicle.pk):
+        _bump(LeadRollup, "leads", row.leads, day=row.day, vehicle_id=None)
+        row.delete()
+
+
+def rebuild(since=None):
+    """
+    Recompute lead rollups for days >= `since` (all days when None) and the
+    inventory rollup as a whole. Returns (lead rows, inventory rows) written.
+    """
+    with transaction.atomic():
+        leads = LeadRollup.objects.all()
+        contacts = Contact.objects.all()
+        if since:
+            leads = leads.filter(day__gte=since)
+            contacts = contacts.filter(created_at__date__gte=since)
+        leads.delete()
+        lead_rows = LeadRollup.objects.bulk_create(
+            LeadRollup(day=row["day"], vehicle_id=row["car"], brand_id=row["car__brand"], leads=row["total"])
+            for row in contacts.annotate(day=TruncDate("created_at"))
+            .values("day", "car", "car__brand")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+
+        # inventar jadvali kichik (kun x brend), uni har safar to'liq qayta hisoblaymiz
+        InventoryRollup.objects.all().delete()
+        inventory_rows = InventoryRollup.objects.bulk_create(
+            InventoryRollup(day=row["day"], brand_id=row["brand"], vehicles=row["total"])
+            for row in Vehicle.objects.annotate(day=TruncDate("created_at"))
+            .values("day", "brand")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+    return len(lead_rows), len(inventory_rows)
+
+
+def dashboard(days=30, limit=10):
+    """Everything the sales dashboard shows, read from the rollup tables only."""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    leads = LeadRollup.objects.filter(day__gte=start).order_by()
+
+    totals_by_day = dict(leads.values_list("day").annotate(total=Sum("leads")))
+    per_day = [
+        {"day": day, "leads": totals_by_day.get(day, 0)}
+        for day in (start + timedelta(days=offset) for offset in range(days))
+    ]
+    per_vehicle = (
+        leads.exclude(vehicle=None)
+        .values("vehicle", "vehicle__title", "vehicle__year")
+        .annotate(leads=Sum("leads"))
+        .order_by("-leads")[:limit]
+    )
+    per_brand = leads.values("brand__name").annotate(leads=Sum("leads")).order_by("-leads")[:limit]
+
+    # brend bo'yicha yig'indi bazada hisoblanadi: kun x brend qatorlari Python ga o'qilmaydi
+    on_lot = list(
+        InventoryRollup.objects.values("brand__name")
+        .annotate(total=Sum("vehicles"), days=Sum(F("vehicles") * _DaysSince("day", today)))
+        .filter(total__gt=0)
+        .order_by()
+    )
+    days_on_lot = sorted(
+        (
+            {"brand": row["brand__name"], "vehicles": row["total"], "average_days": row["days"] / row["total"]}
+            for row in on_lot
+        ),
+        key=lambda row: -row["average_days"],
+    )
+    listed = sum(row["total"] for row in on_lot)
+
+    return {
+        "days": days,
+        "total_leads": sum(row["leads"] for row in per_day),
+        "per_day": per_day,
+        "per_vehicle": list(per_vehicle),
+        "per_brand": list(per_brand),
+        "days_on_lot": days_on_lot,
+        "listed": listed,
+        "average_days_on_lot": sum(row["days"] for row in on_lot) / listed if listed else 0,
+    }
@@ -0,0 +1,85 @@
+import logging
+from functools import wraps
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import rollups
+from .models import Contact, Vehicle
+
+logger = logging.getLogger(__name__)
+
+
+def rollup_handler(func):
+    """
+    Run a rollup update in its own savepoint and log failures: analytics
+    bookkeeping must never break saving a lead or a vehicle.
+    `manage.py rollup_analytics` repairs whatever was missed.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            with transaction.atomic():
+                func(*args, **kwargs)
+        except Exception:
+            logger.exception("Sales rollup update failed in %s; run manage.py rollup_analytics", func.__name__)
+    return wrapper
+
+
+@receiver(pre_save, sender=Contact)
+@rollup_handler
+def remember_contact_car(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous_car = None
+    if instance.pk and not raw:
+        instance._rollup_previous_car = sender.objects.filter(pk=instance.pk).values_list("car", flat=True).first()
+
+
+@receiver(post_save, sender=Contact)
+@rollup_handler
+def count_lead(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    brand_id = instance.car.brand_id if instance.car else None
+    if created:
+        rollups.add_lead(instance.created_at, instance.car_id, brand_id)
+        return
+    previous_car_id = getattr(instance, "_rollup_previous_car", None)
+    if previous_car_id != instance.car_id:
+        # lead boshqa mashinaga ko'chirildi
+        rollups.add_lead(instance.created_at, previous_car_id, None, amount=-1)
+        rollups.add_lead(instance.created_at, instance.car_id, brand_id)
+
+
+@receiver(post_delete, sender=Contact)
+@rollup_handler
+def uncount_lead(sender, instance, **kwargs):
+    rollups.add_lead(instance.created_at, instance.car_id, None, amount=-1)
+
+
+@receiver(pre_save, sender=Vehicle)
+@rollup_handler
+def remember_vehicle_brand(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous_brand = None
+    if instance.pk and not raw:
+        instance._rollup_previous_brand = sender.objects.filter(pk=instance.pk).values_list("brand", flat=True).first()
+
+
+@receiver(post_save, sender=Vehicle)
+@rollup_handler
+def count_listing(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        rollups.add_listing(instance.created_at, instance.brand_id)
+        return
+    previous_brand_id = getattr(instance, "_rollup_previous_brand", None)
+    if previous_brand_id != instance.brand_id:
+        rollups.change_vehicle_brand(instance, previous_brand_id)
+
+
+# pre_delete: Contact.car va rollup FK lari yangilanishidan oldin ishlashi kerak
+@receiver(pre_delete, sender=Vehicle)
+@rollup_handler
+def uncount_listing(sender, instance, **kwargs):
+    rollups.remove_vehicle(instance)
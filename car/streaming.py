@@ -0,0 +1,115 @@
+"""
+Streaming render for the DB-stored home page template (IndexModel.code).
+
+The page is rendered once with the `{% for car in cars %}` loop swapped for a
+marker, so everything before the loop (head, navigation, filters) can be sent
+straight away. The loop body is then rendered for rows read from the database
+in chunks, followed by the rest of the page.
+"""
+import secrets
+
+from django.template import RequestContext
+from django.template.defaulttags import ForNode
+
+STREAM_CHUNK_SIZE = 20
+
+
+class StreamedRows:
+    """
+    Queryset stand-in for templates: len() is a COUNT query and iterating
+    reads rows in chunks instead of loading the whole inventory.
+    """
+
+    def __init__(self, queryset, chunk_size=STREAM_CHUNK_SIZE):
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+        self._count = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.queryset.count()
+        return self._count
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return self.queryset.iterator(chunk_size=self.chunk_size)
+
+    def __getattr__(self, name):
+        return getattr(self.queryset, name)
+
+
+def _find_loop(template, loop_var):
+    for node in template.nodelist.get_nodes_by_type(ForNode):
+        if node.sequence.token == loop_var and len(node.loopvars) == 1 and not node.is_reversed:
+            return node
+    return None
+
+
+def stream_template(template, context, request, loop_var="cars", chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield `template` rendered with `context` in pieces: the part before the
+    `loop_var` loop, the loop output every `chunk_size` rows, then the rest.
+    `context[loop_var]` should be a queryset. Templates without such a loop
+    are rendered in one piece.
+    """
+    rows = StreamedRows(context[loop_var], chunk_size)
+    context = RequestContext(request, {**context, loop_var: rows})
+    loop = _find_loop(template, loop_var)
+
+    with context.render_context.push_state(template), context.bind_template(template):
+        if loop is None:
+            yield template._render(context)
+            return
+
+        # sahifani bir marta marker bilan render qilamiz va shu joyidan bo'lamiz
+        marker = f"<!--stream-{secrets.token_hex(8)}-->"
+        original_render = loop.render
+        calls = []
+
+        def render_marker(ctx):
+            # faqat birinchi uchragan sikl marker bilan almashtiriladi
+            calls.append(ctx)
+            return marker if len(calls) == 1 else original_render(ctx)
+
+        loop.render = render_marker
+        try:
+            page = template._render(context)
+        finally:
+            del loop.render
+        if marker not in page:
+            yield page
+            return
+        head, tail = page.split(marker, 1)
+        yield head
+
+        if not rows:
+            yield loop.nodelist_empty.render(context)
+        else:
+            yield from _render_loop(loop, rows, context, chunk_size)
+        yield tail
+
+
+def _render_loop(loop, rows, context, chunk_size):
+    parentloop = context.get("forloop", {})
+    total = len(rows)
+    buffer = []
+    with context.push():
+        forloop = context["forloop"] = {"parentloop": parentloop}
+        for i, item in enumerate(rows):
+            forloop.update(
+                counter0=i,
+                counter=i + 1,
+                revcounter=total - i,
+                revcounter0=total - i - 1,
+                first=i == 0,
+                last=i == total - 1,
+            )
+            context[loop.loopvars[0]] = item
+            buffer.append(loop.nodelist_loop.render(context))
+            if len(buffer) >= chunk_size:
+                yield "".join(buffer)
+                buffer = []
+    if buffer:
+        yield "".join(buffer)
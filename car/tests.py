@@ -1,3 +1,452 @@
-from django.test import TestCase
+import gzip
+import multiprocessing
+import random
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import ExifTags, Image
+
+from . import rollups
+from .imaging import normalize_photo
+from .management.commands.index_advisor import Command as IndexAdvisor
+from .management.commands.profile_startup import TIME_TO_FIRST_REQUEST_BUDGET_MS
+from .middleware import CompressionMiddleware, accepted_encodings
+from .models import (
+    MAX_VEHICLE_IMAGES, Brand, Contact, IndexModel, InventoryRollup, LeadRollup, Vehicle, VehicleImage,
+)
+from .photos import _attach, _is_duplicate, ingest_photos
+from .streaming import STREAM_CHUNK_SIZE
+
+
+class RollupSignalTests(TestCase):
+    """Incremental rollup updates must always match rollups.rebuild()."""
+
+    def setUp(self):
+        self.ford = Brand.objects.create(name="Ford")
+        self.chevy = Brand.objects.create(name="Chevrolet")
+        self.mustang = Vehicle.objects.create(title="Mustang", brand=self.ford)
+        self.bel_air = Vehicle.objects.create(title="Bel Air", brand=self.chevy)
+
+    def snapshot(self):
+        return (
+            sorted(LeadRollup.objects.values_list("day", "vehicle", "brand", "leads"), key=str),
+            sorted(InventoryRollup.objects.values_list("day", "brand", "vehicles"), key=str),
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        rollups.rebuild()
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_new_leads_and_listings(self):
+        Contact.objects.create(car=self.mustang, email="a@example.com")
+        Contact.objects.create(car=self.mustang, email="b@example.com")
+        Contact.objects.create(email="general@example.com")
+        today = timezone.localdate()
+        self.assertEqual(LeadRollup.objects.get(vehicle=self.mustang).leads, 2)
+        self.assertEqual(LeadRollup.objects.get(vehicle=None).brand, None)
+        self.assertEqual(InventoryRollup.objects.get(day=today, brand=self.ford).vehicles, 1)
+        self.assertMatchesRebuild()
+
+    def test_lead_deleted(self):
+        contact = Contact.objects.create(car=self.mustang, email="a@example.com")
+        Contact.objects.create(car=self.bel_air, email="b@example.com")
+        contact.delete()
+        self.assertFalse(LeadRollup.objects.filter(vehicle=self.mustang).exists())
+        self.assertMatchesRebuild()
+
+    def test_lead_reassigned(self):
+        contact = Contact.objects.create(car=self.mustang, email="a@example.com")
+        contact.car = self.bel_air
+        contact.save()
+        self.assertMatchesRebuild()
+        contact.car = None
+        contact.save()
+        self.assertMatchesRebuild()
+
+    def test_vehicle_brand_changed(self):
+        contact = Contact.objects.create(car=self.mustang, email="a@example.com")
+        self.mustang.brand = self.chevy
+        self.mustang.save()
+        self.assertEqual(LeadRollup.objects.get(vehicle=self.mustang).brand, self.chevy)
+        self.assertMatchesRebuild()
+        # kamaytirish saqlangan kalit bo'yicha, joriy brend bo'yicha emas
+        contact.delete()
+        self.assertMatchesRebuild()
+
+    def test_vehicle_deleted(self):
+        Contact.objects.create(car=self.mustang, email="a@example.com")
+        Contact.objects.create(email="general@example.com")
+        self.mustang.delete()
+        self.assertEqual(LeadRollup.objects.get(vehicle=None).leads, 2)
+        self.assertMatchesRebuild()
+
+    def test_brand_deleted(self):
+        Contact.objects.create(car=self.mustang, email="a@example.com")
+        self.ford.delete()
+        self.assertFalse(InventoryRollup.objects.filter(brand_id=self.ford.pk).exists())
+        self.assertMatchesRebuild()
+
+    def test_rollup_keys_are_unique(self):
+        Contact.objects.create(car=self.mustang, email="a@example.com")
+        Contact.objects.create(email="general@example.com")
+        today = timezone.localdate()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            LeadRollup.objects.create(day=today, vehicle=None, leads=1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            LeadRollup.objects.create(day=today, vehicle=self.mustang, leads=1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            InventoryRollup.objects.create(day=today, brand=self.ford, vehicles=1)
+
+    def test_rollup_failure_keeps_the_lead(self):
+        with mock.patch("car.rollups.add_lead", side_effect=RuntimeError("boom")), \
+                self.assertLogs("car.signals", level="ERROR"):
+            contact = Contact.objects.create(car=self.mustang, email="a@example.com")
+        self.assertTrue(Contact.objects.filter(pk=contact.pk).exists())
+
+
+class DashboardTests(TestCase):
+
+    def test_days_on_lot(self):
+        today = timezone.localdate()
+        ford = Brand.objects.create(name="Ford")
+        InventoryRollup.objects.bulk_create([
+            InventoryRollup(day=today - timedelta(days=10), brand=ford, vehicles=3),
+            InventoryRollup(day=today - timedelta(days=2), brand=ford, vehicles=1),
+            InventoryRollup(day=today, brand=None, vehicles=2),
+            InventoryRollup(day=today - timedelta(days=400), brand=None, vehicles=0),
+        ])
+        with self.assertNumQueries(4):
+            data = rollups.dashboard(days=7)
+        self.assertEqual(data["days_on_lot"], [
+            {"brand": "Ford", "vehicles": 4, "average_days": 8.0},
+            {"brand": None, "vehicles": 2, "average_days": 0.0},
+        ])
+        self.assertEqual(data["listed"], 6)
+        self.assertEqual(data["average_days_on_lot"], 32 / 6)
+
+
+    def test_admin_page(self):
+        InventoryRollup.objects.create(day=timezone.localdate(), vehicles=1)
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "password"))
+        response = self.client.get(reverse("admin:car_leadrollup_changelist"), {"days": "90"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["days"], 90)
+
+
+class ContactViewTests(TestCase):
+
+    @mock.patch("car.views.send_telegram")
+    def test_contact_is_saved_and_counted(self, send_telegram):
+        car = Vehicle.objects.create(title="Mustang")
+        response = self.client.post(
+            reverse("car:contact_for_car", args=[car.pk]),
+            {"name": "Ali", "email": "ali@example.com", "phone": "123", "message": "Hi"},
+        )
+        self.assertRedirects(response, reverse("car:thank_you"), fetch_redirect_response=False)
+        self.assertEqual(Contact.objects.get().car, car)
+        self.assertEqual(LeadRollup.objects.get(vehicle=car).leads, 1)
+        send_telegram.assert_called_once()
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class CompressionMiddlewareTests(TestCase):
+
+    def process(self, accept_encoding, response):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response).process_response(request, response)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings("gzip, deflate, br"), {"gzip", "deflate", "br"})
+        self.assertEqual(accepted_encodings("gzip, br;q=0"), {"gzip"})
+        self.assertEqual(accepted_encodings("br; q=0.0, GZIP;q=0.5"), {"gzip"})
+        self.assertEqual(accepted_encodings("*;q=0.1, gzip;q=0"), {"*", "br"})
+        self.assertEqual(accepted_encodings("identity"), {"identity"})
+        self.assertEqual(accepted_encodings(""), set())
+
+    def test_refused_encodings_are_not_used(self):
+        for header in ("gzip;q=0", "identity", "*;q=0", "br;q=0, gzip;q=0"):
+            with self.subTest(header=header):
+                response = self.process(header, HttpResponse(b"x" * 500))
+                self.assertFalse(response.has_header("Content-Encoding"))
+                self.assertEqual(response.content, b"x" * 500)
+                self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_streamed_gzip(self):
+        response = self.process("br;q=0, gzip", StreamingHttpResponse([b"a" * 300, b"b" * 300]))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), b"a" * 300 + b"b" * 300)
+
+
+class IndexAdvisorTests(TestCase):
+
+    def setUp(self):
+        brand = Brand.objects.create(name="Ford")
+        for year, price in [(2012, 25000), (2015, 40000), (1957, 90000)]:
+            Vehicle.objects.create(title="Car", brand=brand, year=year, price=price)
+
+    def plans(self, label):
+        return [plan for shape, sql, plan in IndexAdvisor().collect() if shape == label and "ORDER BY" in sql]
+
+    def test_flags(self):
+        self.assertEqual(IndexAdvisor.flags(["SEARCH car_vehicle USING INDEX car_vehicle_year_1027b9_idx (year>? AND year<?)"]), [])
+        self.assertEqual(len(IndexAdvisor.flags(["SCAN car_vehicle"])), 1)
+        # butun indeksni aylanish ham belgilanadi
+        self.assertEqual(
+            IndexAdvisor.flags(["SCAN car_vehicle USING COVERING INDEX car_vehicle_year_1027b9_idx"]),
+            ["index scan: SCAN car_vehicle USING COVERING INDEX car_vehicle_year_1027b9_idx"],
+        )
+        self.assertEqual(len(IndexAdvisor.flags(["SCAN CONSTANT ROW", "USE TEMP B-TREE FOR ORDER BY"])), 1)
+
+    def test_year_and_price_range(self):
+        plan, = self.plans("home: year + price range")
+        self.assertIn("SEARCH car_vehicle USING INDEX car_vehicle_year_1027b9_idx (year>? AND year<?)", plan)
+        # qabul qilingan cheklov: ikki diapazon filtri bilan created_at tartibi saralashni talab qiladi
+        self.assertIn("USE TEMP B-TREE FOR ORDER BY", plan)
+
+    def test_plans_do_not_depend_on_matching_rows(self):
+        Vehicle.objects.all().delete()
+        self.assertEqual(len(self.plans("home: year + price range")), 1)
+        plan, = self.plans("home: price range")
+        self.assertEqual(plan, ["SCAN car_vehicle USING INDEX car_vehicle_created_5dc078_idx"])
+
+    def test_verify(self):
+        out = StringIO()
+        call_command("index_advisor", "--verify", stdout=out)
+        output = out.getvalue()
+        self.assertIn("home: year + price range: 2 -> 1\n      still: temp sort: USE TEMP B-TREE FOR ORDER BY", output)
+        self.assertIn("none got worse", output)
+        # tekshiruv tranzaksiyasi qaytariladi, indekslar joyida qoladi
+        self.assertIn("car_vehicle_year_1027b9_idx", IndexAdvisor().existing_index_names(Vehicle))
+
+
+def noise_photo(seed, size=(64, 48), **save_kwargs):
+    """JPEG bytes of a random-noise image: every seed gives a perceptually different photo."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", size)
+    image.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(size[0] * size[1])])
+    output = BytesIO()
+    image.save(output, "JPEG", **save_kwargs)
+    return output.getvalue()
+
+
+def resized(data, factor=2):
+    with Image.open(BytesIO(data)) as image:
+        image = image.resize((image.width * factor, image.height * factor), Image.Resampling.NEAREST)
+        output = BytesIO()
+        image.save(output, "JPEG", quality=95)
+    return output.getvalue()
+
+
+class PhotoIngestTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+        self.vehicle = Vehicle.objects.create(title="Bel Air")
+
+    def ingest(self, *sources):
+        return ingest_photos({self.vehicle: list(sources)}, workers=1)[self.vehicle]
+
+    def stored_files(self):
+        return [path for path in Path(self.media_root).rglob("*") if path.is_file()]
+
+    def test_orientation_applied_and_metadata_stripped(self):
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = 6
+        exif.get_ifd(ExifTags.IFD.GPSInfo)[ExifTags.GPS.GPSLatitudeRef] = "N"
+        data = noise_photo(1, size=(64, 32), exif=exif.tobytes())
+        with Image.open(BytesIO(data)) as original:
+            self.assertTrue(original.getexif().get_ifd(ExifTags.IFD.GPSInfo))
+
+        photo = normalize_photo(("car.jpg", data))
+        with Image.open(BytesIO(photo["data"])) as image:
+            # 6 = 90 gradusga burilgan: eni va bo'yi almashadi
+            self.assertEqual(image.size, (32, 64))
+            self.assertEqual(dict(image.getexif()), {})
+            self.assertNotIn("exif", image.info)
+
+    def test_duplicates_in_batch(self):
+        first = noise_photo(1)
+        # b: bir xil bayt (sha256), c: kattalashtirilgan nusxa (dhash)
+        result = self.ingest(("a.jpg", first), ("b.jpg", first), ("c.jpg", resized(first)), ("d.jpg", noise_photo(2)))
+        self.assertEqual(len(result.created), 2)
+        self.assertEqual(result.duplicates, ["b.jpg", "c.jpg"])
+
+    def test_duplicates_of_stored_images(self):
+        first = noise_photo(1)
+        self.assertEqual(len(self.ingest(("a.jpg", first)).created), 1)
+        result = self.ingest(("again.jpg", first), ("bigger.jpg", resized(first)), ("new.jpg", noise_photo(2)))
+        self.assertEqual(result.duplicates, ["again.jpg", "bigger.jpg"])
+        self.assertEqual([image.image.name.rsplit("/", 1)[-1] for image in result.created], ["new.jpg"])
+
+    def test_is_duplicate(self):
+        photo = {"digest": "abc", "phash": 0b1111}
+        # sha256 mos kelsa dhash farqi ahamiyatsiz
+        self.assertTrue(_is_duplicate(photo, {"abc"}, {2 ** 63}))
+        self.assertTrue(_is_duplicate(photo, set(), {0b1111_0000_1111}))
+        self.assertFalse(_is_duplicate(photo, set(), {0b1111_1111_1111}))
+
+    def test_order_continues_after_existing_images(self):
+        VehicleImage.objects.create(vehicle=self.vehicle, order=5)
+        result = self.ingest(("a.jpg", noise_photo(1)), ("b.jpg", noise_photo(2)))
+        self.assertEqual([image.order for image in result.created], [6, 7])
+
+    def test_image_limit(self):
+        VehicleImage.objects.bulk_create(
+            VehicleImage(vehicle=self.vehicle, order=order) for order in range(MAX_VEHICLE_IMAGES - 1)
+        )
+        result = self.ingest(*((f"{seed}.jpg", noise_photo(seed)) for seed in range(3)))
+        self.assertEqual(len(result.created), 1)
+        self.assertEqual(result.over_limit, ["1.jpg", "2.jpg"])
+        self.assertEqual(self.vehicle.images.count(), MAX_VEHICLE_IMAGES)
+
+    def test_unreadable_files_are_reported(self):
+        result = self.ingest(("broken.jpg", b"not an image"), ("a.jpg", noise_photo(1)))
+        self.assertEqual(result.errors, ["broken.jpg: not a recognised image format"])
+        self.assertEqual(len(result.created), 1)
+
+    def test_written_files_are_deleted_on_rollback(self):
+        photos = [normalize_photo((f"{seed}.jpg", noise_photo(seed))) for seed in range(3)]
+        save = VehicleImage.save
+        calls = []
+
+        def failing_save(image, *args, **kwargs):
+            calls.append(image)
+            if len(calls) == 2:
+                raise RuntimeError("database went away")
+            return save(image, *args, **kwargs)
+
+        with mock.patch.object(VehicleImage, "save", failing_save), self.assertRaises(RuntimeError):
+            _attach(self.vehicle, photos, set())
+        self.assertEqual(self.stored_files(), [])
+        self.assertFalse(self.vehicle.images.exists())
+
+    def test_workers_run_under_spawn(self):
+        # spawn/forkserver da worker modul Django sozlanmagan holda import qilinadi
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            photo = executor.submit(normalize_photo, ("a.jpg", noise_photo(1))).result()
+        self.assertNotIn("error", photo)
+
+    def test_admin_bulk_upload(self):
+        user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as opened:
+            opened.writestr("photos/a.jpg", noise_photo(1))
+            opened.writestr("photos/b.jpg", noise_photo(2))
+            opened.writestr("photos/notes.txt", "not a photo")
+            opened.writestr("__MACOSX/photos/._a.jpg", b"resource fork")
+        upload = SimpleUploadedFile("photos.zip", archive.getvalue(), content_type="application/zip")
+
+        with mock.patch("car.photos.ProcessPoolExecutor") as pool:
+            response = self.client.post(
+                reverse("admin:car_vehicle_bulk_photos", args=[self.vehicle.pk]), {"archive": upload}
+            )
+        self.assertRedirects(
+            response, reverse("admin:car_vehicle_change", args=[self.vehicle.pk]), fetch_redirect_response=False
+        )
+        pool.assert_not_called()
+        self.assertEqual(self.vehicle.images.count(), 2)
+        self.assertEqual(len(self.stored_files()), 2)
+
+
+class StartupBudgetTests(SimpleTestCase):
+
+    def test_time_to_first_request(self):
+        # yangi jarayonda haqiqiy sozlamalar bilan ishlaydi; chegara oshsa CommandError
+        out = StringIO()
+        call_command("profile_startup", "--top", "5", stdout=out)
+        self.assertIn("Time to first request:", out.getvalue())
+        self.assertIn(f"budget {TIME_TO_FIRST_REQUEST_BUDGET_MS} ms", out.getvalue())
+        self.assertIn("-> 200 OK", out.getvalue())
+
+
+HOME_PAGE = """<h1>Inventory ({{ cars|length }})</h1>{% csrf_token %}
+<ul>{% for car in cars %}
+<li class="{% cycle 'odd' 'even' %}{% if forloop.first %} first{% endif %}{% if forloop.last %} last{% endif %}">
+{{ forloop.counter }}/{{ forloop.revcounter }} {{ car.title }} {{ car.year }}</li>
+{% empty %}<li>No vehicles yet</li>{% endfor %}</ul>
+<footer>{{ cars|length }} listed</footer>"""
+
+
+class StreamingHomeTests(TestCase):
+
+    def setUp(self):
+        IndexModel.objects.create(code=HOME_PAGE)
+
+    def add_vehicles(self, count):
+        for number in range(count):
+            Vehicle.objects.create(title=f"Car {number}", year=1950 + number)
+
+    def get(self, stream, **headers):
+        with override_settings(STREAM_INVENTORY=stream):
+            return self.client.get("/", **headers)
+
+    def assertStreamMatchesPlainRender(self):
+        plain = self.get(False)
+        streamed = self.get(True)
+        self.assertFalse(plain.streaming)
+        self.assertTrue(streamed.streaming)
+        # index.html {{ rendered_code }} dan keyin yangi qator qo'shadi
+        self.assertEqual(
+            self.without_csrf(b"".join(streamed.streaming_content).decode()),
+            self.without_csrf(plain.content.decode().removesuffix("\n")),
+        )
+
+    def test_stream_matches_plain_render(self):
+        self.add_vehicles(STREAM_CHUNK_SIZE * 2 + 3)
+        self.assertStreamMatchesPlainRender()
+
+    def test_empty_inventory(self):
+        self.assertStreamMatchesPlainRender()
+
+    def test_head_is_sent_before_rows_are_read(self):
+        self.add_vehicles(3)
+        chunks = iter(self.get(True).streaming_content)
+        with CaptureQueriesContext(connection) as queries:
+            head = next(chunks).decode()
+        self.assertIn("<h1>Inventory (3)</h1>", head)
+        self.assertNotIn("Car 0", head)
+        self.assertFalse(any('"car_vehicle"."title"' in query["sql"] for query in queries))
+
+        with CaptureQueriesContext(connection) as queries:
+            rest = b"".join(chunks).decode()
+        self.assertIn("Car 0", rest)
+        self.assertTrue(any('"car_vehicle"."title"' in query["sql"] for query in queries))
+
+    def test_streamed_page_is_gzipped_not_brotli(self):
+        self.add_vehicles(3)
+        plain = self.get(False).content.decode().removesuffix("\n")
+        # sahifada CSRF token bor: BREACH sababli faqat gzip (tasodifiy to'ldirish bilan)
+        response = self.get(True, HTTP_ACCEPT_ENCODING="br, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        body = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertEqual(self.without_csrf(body), self.without_csrf(plain))
+
+    @staticmethod
+    def without_csrf(page):
+        # token har render da boshqacha niqoblanadi
+        head, rest = page.split('name="csrfmiddlewaretoken" value="', 1)
+        return head + rest.split('"', 1)[1]
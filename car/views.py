@@ -1,5 +1,8 @@
-import requests
+from functools import cache
+
 from django.shortcuts import render,redirect
+from django.http import StreamingHttpResponse
+from django.middleware.csrf import get_token
 from django.views.generic import ListView,FormView,DetailView,TemplateView
 from decouple import config
 from django.core.mail import send_mail
@@ -10,10 +13,24 @@ from django.template import Template, RequestContext
 
 from .models import VehicleImage,Vehicle,Feature,SiteInfo,Aboutpage,IndexModel,ShippingPage,Privacy,TermsOfUse
 from .forms import ContactForm
+from .streaming import stream_template
+
+
+@cache
+def telegram_credentials():
+    # .env dan import paytida emas, birinchi xabar yuborilganda o'qiladi
+    return config("BOT_TOKEN"), config("CHANNEL_ID")
 
 
-TELEGRAM_BOT_TOKEN =config("BOT_TOKEN")
-TELEGRAM_CHAT_ID = config("CHANNEL_ID")
+def send_telegram(text):
+    # requests og'ir modul: worker ishga tushishini sekinlashtirmasligi uchun shu yerda import qilinadi
+    import requests
+
+    bot_token, chat_id = telegram_credentials()
+    requests.get(
+        f"https://api.telegram.org/bot{bot_token}/sendMessage",
+        params={"chat_id": chat_id, "text": text}
+    )
 
 class HomeView(ListView):
     template_name = "index.html"
@@ -57,7 +74,7 @@ class HomeView(ListView):
         vehicles = Vehicle.objects.all()
 
                 
-        makes = vehicles.values_list('brand', flat=True).distinct()
+        makes = vehicles.values_list('brand', flat=True).order_by('brand').distinct()
         context['makes'] = makes
         
          # Mavjud yillar ni olish va guruhlash
@@ -79,15 +96,6 @@ class HomeView(ListView):
                         'count': len(decade_years)
                     })
 
-        page = IndexModel.objects.first()
-
-        if page:
-            tpl = Template(page.code)
-            rendered_html = tpl.render(RequestContext(self.request, context))
-            context['rendered_code'] = rendered_html
-        else:
-            context['rendered_code'] = ''
-
         context['year_ranges'] = year_ranges
         context['all_years'] = list(years)  # Alohida yillar ham kerak bo'lsa
         
@@ -103,6 +111,24 @@ class HomeView(ListView):
         context['current_max_price'] = self.request.GET.get('max_price', '')
         
         return context
+
+    def render_to_response(self, context, **response_kwargs):
+        page = context['code']
+
+        if page and settings.STREAM_INVENTORY:
+            # CSRF cookie sarlavhalar bilan ketishi kerak, forma esa keyinroq render qilinadi
+            get_token(self.request)
+            cars = context['cars'].prefetch_related('images')
+            content = stream_template(Template(page.code), {**context, 'cars': cars}, self.request)
+            return StreamingHttpResponse(content, content_type="text/html; charset=utf-8", **response_kwargs)
+
+        if page:
+            tpl = Template(page.code)
+            rendered_html = tpl.render(RequestContext(self.request, context))
+            context['rendered_code'] = rendered_html
+        else:
+            context['rendered_code'] = ''
+        return super().render_to_response(context, **response_kwargs)
     
 class CarDetailView(DetailView):
     model = Vehicle
@@ -143,10 +169,7 @@ class ContactView(FormView):
         if contact.car:
             text += f"\n🚗 Vehicle: {contact.car.title} ({contact.car.year})\nVIN: {contact.car.vin}"
 
-        requests.get(
-            f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage",
-            params={"chat_id": TELEGRAM_CHAT_ID, "text": text}
-        )
+        send_telegram(text)
 
         # --- Send Email ---
         email_message = text.replace("\n", "<br>")